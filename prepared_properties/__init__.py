@@ -7,6 +7,7 @@ __version__ = "1.0.3"
 from .prepared_properties import (
     AnnotatedProperty,
     PrefetchedProperty,
+    Preparer,
     PropertiedQueryset,
     annotated_property,
 )
@@ -15,5 +16,6 @@ __all__ = [
     "AnnotatedProperty",
     "annotated_property",
     "PrefetchedProperty",
+    "Preparer",
     "PropertiedQueryset",
 ]
@@ -1,11 +1,15 @@
 import warnings
-from abc import ABC
-from collections import deque
 
-from django.db.models import Prefetch, QuerySet
+from django.db.models import ForeignKey, Prefetch, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.fields.related_descriptors import (
+    ManyToManyDescriptor,
+    ReverseManyToOneDescriptor,
+    ReverseOneToOneDescriptor,
+)
 
 
-class NamedDescriptor(ABC):
+class NamedDescriptor:
     def __init__(self, field_name=None):
         # the field name can be set explicitly using the constructor, but by
         # default we use the name of the attr this descriptor is set on, as
@@ -21,6 +25,8 @@ class NamedDescriptor(ABC):
         if not self.field_name:
             self.field_name = field_name
 
+        # prepared values are stored straight on the instance under this name.
+        self._cache_attr = f"_pp_{self.field_name}"
         self.owner = owner
 
     def __get__(self, instance, owner):
@@ -30,7 +36,7 @@ class NamedDescriptor(ABC):
             return self
 
         try:
-            return getattr(instance, "_properties_cache", {})[self.field_name]
+            return instance.__dict__[self._cache_attr]
         except KeyError:
             if not self.getter:
                 raise AttributeError(
@@ -45,10 +51,7 @@ class NamedDescriptor(ABC):
 
     # called when ModelIterable setattrs the annotations onto the model
     def __set__(self, instance, value):
-        if not hasattr(instance, "_properties_cache"):
-            instance._properties_cache = {}
-
-        instance._properties_cache[self.field_name] = value
+        instance.__dict__[self._cache_attr] = value
         self._was_prepared = True
 
     def __str__(self):
@@ -67,21 +70,48 @@ class AnnotatedProperty(NamedDescriptor):
         self._annotation = annotation
         self._depends_on = depends_on or []
 
+    def __set_name__(self, owner, field_name):
+        super().__set_name__(owner, field_name)
+
+        # all attributes in the class body are set on the owner by now, so we
+        # can usually resolve the dependencies right away. if one isn't there
+        # yet (eg. it is added to the class later), `depends_on` will try
+        # again on first access.
+        try:
+            self.depends_on
+        except AttributeError:
+            pass
+
     @property
     def annotation(self):
+        try:
+            return self._resolved_annotation
+        except AttributeError:
+            pass
+
         # we allow the annotation to be callable to be able to avoid cyclic
         # references (you can't refer to the same model as the one you're
         # annotating as the decorator is called before the class is created.)
+        # by the time it is first needed, the models exist, so we only have to
+        # call it once.
         if callable(self._annotation):
-            return self._annotation()
+            self._resolved_annotation = self._annotation()
+        else:
+            self._resolved_annotation = self._annotation
 
-        return self._annotation
+        return self._resolved_annotation
 
     @property
     def depends_on(self):
-        return (
-            getattr(self.owner, prop_name) for prop_name in self._depends_on
-        )
+        # the dependencies are only looked up on the owner once, as the
+        # descriptors they refer to don't change.
+        try:
+            return self._resolved_depends_on
+        except AttributeError:
+            self._resolved_depends_on = tuple(
+                getattr(self.owner, prop_name) for prop_name in self._depends_on
+            )
+            return self._resolved_depends_on
 
 
 class _AnnotatedPropertyFactory:
@@ -94,65 +124,244 @@ class _AnnotatedPropertyFactory:
         self.depends_on = depends_on
 
     def __call__(self, getter):
-        return AnnotatedProperty(self.subquery, getter, self.depends_on)
+        return AnnotatedProperty(
+            self.subquery, getter, depends_on=self.depends_on
+        )
 
 
 annotated_property = _AnnotatedPropertyFactory
 
 
 class PrefetchedProperty(NamedDescriptor):
-    def __init__(self, m2m_name, queryset, getter=None, field_name=None):
+    def __init__(
+        self, m2m_name, queryset, getter=None, field_name=None, fields=None
+    ):
         super().__init__(field_name=field_name)
         self.m2m_name = m2m_name
         self.queryset = queryset
         self.getter = getter
+        # if given, only these fields are loaded for the prefetched objects.
+        # accessing any other field will do a query per object!
+        self.fields = fields
+
+    @property
+    def prefetch(self):
+        # the prefetch never changes, so there's no need to build it again
+        # each time the property is prepared. it's built on first access, as
+        # reverse relations are only added to the owner once the related model
+        # is loaded.
+        try:
+            return self._prefetch
+        except AttributeError:
+            queryset = self.queryset
+            if self.fields:
+                queryset = queryset.only(
+                    *self.fields, *self._relation_fields()
+                )
+
+            self._prefetch = Prefetch(
+                self.m2m_name, queryset, to_attr=self.field_name
+            )
+            return self._prefetch
+
+    def _relation_fields(self):
+        # django needs the foreign key of a reverse relation to match the
+        # prefetched objects to their instances, deferring it would do a query
+        # per object. for many to many relations it adds the join column
+        # itself.
+        if LOOKUP_SEP in self.m2m_name:
+            raise ValueError(
+                f"fields can't be used for {self}, as it prefetches the "
+                f"lookup path {self.m2m_name!r}."
+            )
+
+        descriptor = getattr(self.owner, self.m2m_name)
+
+        if isinstance(descriptor, ManyToManyDescriptor):
+            return ()
+
+        if isinstance(descriptor, ReverseManyToOneDescriptor):
+            # generic relations also use this descriptor, but match on more
+            # than one column.
+            if not isinstance(descriptor.field, ForeignKey):
+                raise ValueError(
+                    f"fields can't be used for {self}, as it prefetches a "
+                    f"{descriptor.field.__class__.__name__}."
+                )
+
+            return (descriptor.field.attname,)
+
+        if isinstance(descriptor, ReverseOneToOneDescriptor):
+            return (descriptor.related.field.attname,)
+
+        return ()
+
+    def get_cached(self, instance):
+        """
+        return the prefetched objects, without ever falling back to the getter
+        or a query.
+        """
+        try:
+            return instance.__dict__[self._cache_attr]
+        except KeyError:
+            raise AttributeError(
+                f"Property {self} was not prefetched on {instance}. "
+                "Use qs.prepare to prefetch it."
+            ) from None
+
+
+# resolution orders only depend on the (class-level, and thus long-lived)
+# descriptors involved, so we compute them once per set of properties.
+_RESOLUTION_CACHE = {}
 
 
 def resolution_order(properties):
-    props_to_annotate = []
-    property_st = deque(properties)
+    # the most common cases: nothing to resolve.
+    if not properties:
+        return ()
+
+    if len(properties) == 1 and not properties[0]._depends_on:
+        return tuple(properties)
+
+    key = frozenset(map(id, properties))
+    try:
+        return _RESOLUTION_CACHE[key]
+    except KeyError:
+        pass
+
+    # first collect all props we need to annotate, along with the amount of
+    # dependencies each of them is still waiting for and the props that depend
+    # on them. `props` grows while we loop over it, so this walks the whole
+    # dependency tree.
+    props = []
+    seen = set()
+    for prop in properties:
+        if id(prop) not in seen:
+            seen.add(id(prop))
+            props.append(prop)
+
+    unresolved = {}
+    dependents = {}
+    for prop in props:
+        dependencies = {id(dep): dep for dep in prop.depends_on}
+        unresolved[id(prop)] = len(dependencies)
+
+        for dependency in dependencies.values():
+            dependents.setdefault(id(dependency), []).append(prop)
+
+            if id(dependency) not in seen:
+                seen.add(id(dependency))
+                props.append(dependency)
+
+    # then start from the props without dependencies and add every other prop
+    # as soon as the last of its dependencies was added (Kahn's algorithm).
+    order = [prop for prop in props if not unresolved[id(prop)]]
+    for prop in order:
+        for dependent in dependents.get(id(prop), ()):
+            unresolved[id(dependent)] -= 1
+
+            if not unresolved[id(dependent)]:
+                order.append(dependent)
+
+    # props that are part of a cycle never run out of dependencies.
+    if len(order) < len(props):
+        raise ValueError(
+            "Cyclic property dependency between "
+            + ", ".join(str(prop) for prop in props if unresolved[id(prop)])
+        )
+
+    order = tuple(order)
+    _RESOLUTION_CACHE[key] = order
+
+    return order
 
-    # we walk through the tree breadth first and
-    # add all encountered props to a list if they weren't
-    # already in there.
-    while len(property_st) > 0:
-        prop = property_st.popleft()
 
-        if prop not in props_to_annotate:
-            props_to_annotate.append(prop)
+def _annotate(qs, ordered_properties):
+    # properties that are already annotated on the queryset (eg. as a
+    # dependency of an earlier call) are skipped.
+    annotations = {
+        prop.field_name: prop.annotation
+        for prop in ordered_properties
+        if prop.field_name not in qs.query.annotations
+    }
 
-        for dependent_prop in prop.depends_on:
-            property_st.appendleft(dependent_prop)
+    # `.annotate` clones the queryset, even if there's nothing to add.
+    if not annotations:
+        return qs
 
-    # since a prop higher up in the tree will be encountered first,
-    # and the deepest dependencies will be encountered last,
-    # reversing this list will give us the correct resolution order.
-    # neat.
-    return reversed(props_to_annotate)
+    return qs.annotate(**annotations)
 
 
 class PropertiedQueryset(QuerySet):
     def prepare(self, *properties):
-        return self.annotate_properties(
-            *[p for p in properties if isinstance(p, AnnotatedProperty)]
-        ).prefetch_properties(
-            *[p for p in properties if isinstance(p, PrefetchedProperty)]
+        annotated, prefetched = [], []
+        for prop in properties:
+            if isinstance(prop, AnnotatedProperty):
+                annotated.append(prop)
+            elif isinstance(prop, PrefetchedProperty):
+                prefetched.append(prop)
+
+        return self.annotate_properties(*annotated).prefetch_properties(
+            *prefetched
+        )
+
+    def prepare_values(self, *properties, fields=()):
+        # `.values()` doesn't do prefetches, so only annotations make sense
+        # here.
+        for prop in properties:
+            if not isinstance(prop, AnnotatedProperty):
+                raise ValueError(
+                    "Only annotated properties can be used with "
+                    f"prepare_values, got {prop}."
+                )
+
+        return self.annotate_properties(*properties).values(
+            *fields, *[prop.field_name for prop in properties]
         )
 
     def annotate_properties(self, *properties):
-        qs = self
         # annotations can depend on eachother and get checked immediately when
-        # `.annotate` is called, so we need to sort them correctly.
-        for prop in resolution_order(properties):
-            qs = qs.annotate(**{prop.field_name: prop.annotation})
-
-        return qs
+        # `.annotate` is called, so we need to sort them correctly. Django
+        # adds the kwargs of a single `.annotate` call in order, so we can
+        # pass them all at once.
+        return _annotate(self, resolution_order(properties))
 
     def prefetch_properties(self, *properties):
-        qs = self
-        for prop in properties:
-            qs = qs.prefetch_related(
-                Prefetch(prop.m2m_name, prop.queryset, to_attr=prop.field_name)
-            )
+        # `.prefetch_related` clones the queryset, even if there's nothing to
+        # add.
+        if not properties:
+            return self
 
-        return qs
+        return self.prefetch_related(*[prop.prefetch for prop in properties])
+
+
+class Preparer:
+    """
+    prepares a fixed set of properties on any queryset, doing all the work
+    that doesn't depend on the queryset (resolving dependencies, building
+    prefetches) only once.
+    """
+
+    def __init__(self, *properties):
+        self._annots = resolution_order(
+            [p for p in properties if isinstance(p, AnnotatedProperty)]
+        )
+        self._prefetched = tuple(
+            p for p in properties if isinstance(p, PrefetchedProperty)
+        )
+
+    def apply(self, qs):
+        qs = _annotate(qs, self._annots)
+
+        if not self._prefetched:
+            return qs
+
+        # prefetches are built on first use rather than in `__init__`, as
+        # reverse relations might not exist yet when a preparer is created
+        # at import time.
+        try:
+            prefs = self._prefs
+        except AttributeError:
+            prefs = self._prefs = tuple(p.prefetch for p in self._prefetched)
+
+        return qs.prefetch_related(*prefs)
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-15 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_project', '0002_note'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='name',
+            field=models.CharField(default='', max_length=100),
+        ),
+    ]
@@ -13,6 +13,16 @@ class Person(models.Model):
     groups = models.ManyToManyField("test_project.Group", related_name="people")
 
     age = models.PositiveIntegerField(default=0)
+    name = models.CharField(max_length=100, default="")
+
+
+class Note(models.Model):
+    group = models.ForeignKey(
+        "test_project.Group", related_name="notes", on_delete=models.CASCADE
+    )
+
+    text = models.CharField(max_length=100, default="")
+    pinned = models.BooleanField(default=False)
 
 
 class Group(models.Model):
@@ -29,7 +39,7 @@ class Group(models.Model):
     def people_count(self):
         return self.people.count()
 
-    @annotated_property(F("people_count") * Value(2))
+    @annotated_property(F("people_count") * Value(2), depends_on=["people_count"])
     def count_times_two(self):
         return self.people.count() * 2
 
@@ -47,3 +57,11 @@ class Group(models.Model):
     )
 
     children = PrefetchedProperty("people", Person.objects.filter(age__lte=18))
+
+    children_ages = PrefetchedProperty(
+        "people", Person.objects.filter(age__lte=18), fields=["age"]
+    )
+
+    pinned_notes = PrefetchedProperty(
+        "notes", Note.objects.filter(pinned=True), fields=["text"]
+    )
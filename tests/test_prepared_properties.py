@@ -1,9 +1,13 @@
 import warnings
 
 import factory
+from django.db.models import F, Value
+from django.test import SimpleTestCase
 from django.test import TestCase as DjangoTestCase
 
-from test_project.models import Group, Person
+from prepared_properties import AnnotatedProperty, PrefetchedProperty, Preparer
+from prepared_properties.prepared_properties import resolution_order
+from test_project.models import Group, Note, Person
 
 warnings.filterwarnings("error", "Getting property")
 
@@ -33,6 +37,57 @@ class GroupFactory(factory.DjangoModelFactory):
         model = Group
 
 
+class Chain:
+    first = AnnotatedProperty(Value(1))
+    second = AnnotatedProperty(F("first") + Value(1), depends_on=["first"])
+    third = AnnotatedProperty(
+        F("second") + F("first"), depends_on=["second", "first"]
+    )
+
+
+class Cycle:
+    first = AnnotatedProperty(F("second"), depends_on=["second"])
+    second = AnnotatedProperty(F("first"), depends_on=["first"])
+
+
+class ResolutionOrderTestCase(SimpleTestCase):
+    def test_dependencies_first(self):
+        self.assertEqual(
+            resolution_order((Chain.third,)),
+            (Chain.first, Chain.second, Chain.third),
+        )
+
+    def test_shared_dependencies_once(self):
+        self.assertEqual(
+            resolution_order((Chain.second, Chain.third, Chain.first)),
+            (Chain.first, Chain.second, Chain.third),
+        )
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            resolution_order((Cycle.first,))
+
+
+class CallableGetter:
+    def __call__(self, instance):
+        return 1
+
+
+class Unnamed:
+    prop = AnnotatedProperty(Value(1), getter=CallableGetter())
+
+
+class Paths:
+    people_groups = PrefetchedProperty(
+        "people__groups", Group.objects.all(), fields=["id"]
+    )
+
+
+class FieldNameTestCase(SimpleTestCase):
+    def test_getter_without_name(self):
+        self.assertEqual(Unnamed.prop.field_name, "prop")
+
+
 class ModelAnnotatedPropertyTestCase(DjangoTestCase):
     def test_simple(self):
 
@@ -60,6 +115,14 @@ class ModelAnnotatedPropertyTestCase(DjangoTestCase):
 
         self.assertEqual(group.is_empty, False)
 
+    def test_decorator_dependent(self):
+
+        group = GroupFactory.create(of_size=3)
+
+        group = Group.objects.annotate_properties(Group.count_times_two).get()
+
+        self.assertEqual(group.count_times_two, 6)
+
     def test_shared_descendant(self):
 
         group = GroupFactory.create(of_size=3)
@@ -68,6 +131,32 @@ class ModelAnnotatedPropertyTestCase(DjangoTestCase):
 
         self.assertEqual(group.count_times_three, 9)
 
+    def test_already_annotated(self):
+
+        group = GroupFactory.create(of_size=3)
+
+        counted = Group.objects.annotate_properties(Group.people_count)
+        qs = counted.annotate_properties(Group.count_times_three)
+
+        self.assertIs(
+            qs.query.annotations["people_count"],
+            counted.query.annotations["people_count"],
+        )
+        self.assertEqual(qs.get().count_times_three, 9)
+
+    def test_storage(self):
+
+        GroupFactory.create(of_size=3)
+
+        plain = Group.objects.get()
+        prepared = Group.objects.prepare(Group.people_count).get()
+
+        # nothing is stored for properties that weren't prepared.
+        self.assertEqual(
+            set(vars(prepared)) - set(vars(plain)),
+            {Group.people_count._cache_attr},
+        )
+
     def test_no_getter(self):
 
         group = GroupFactory.create(of_size=3)
@@ -84,6 +173,23 @@ class ModelAnnotatedPropertyTestCase(DjangoTestCase):
         with self.assertWarns(UserWarning):
             self.assertEqual(group.people_count, 3)
 
+    def test_values(self):
+
+        group = GroupFactory.create(of_size=3)
+
+        values = Group.objects.prepare_values(
+            Group.is_empty, Group.count_times_three, fields=["pk"]
+        ).get()
+
+        self.assertEqual(
+            values, {"pk": group.pk, "is_empty": False, "count_times_three": 9}
+        )
+
+    def test_values_prefetched(self):
+
+        with self.assertRaises(ValueError):
+            Group.objects.prepare_values(Group.children)
+
 
 class PrefetchedPropertyTestCase(DjangoTestCase):
     def test_simple(self):
@@ -93,6 +199,53 @@ class PrefetchedPropertyTestCase(DjangoTestCase):
 
         self.assertCountEqual([c.age for c in group.children], [5, 17])
 
+    def test_fields(self):
+        GroupFactory.create(with_people_ages=[5, 17, 45, 19])
+
+        with self.assertNumQueries(2):
+            group = Group.objects.prefetch_properties(Group.children_ages).get()
+
+            self.assertCountEqual([c.age for c in group.children_ages], [5, 17])
+            self.assertEqual(
+                group.children_ages[0].get_deferred_fields(), {"name"}
+            )
+
+    def test_fields_reverse_foreign_key(self):
+        group = GroupFactory.create()
+        for text, pinned in [("a", True), ("b", True), ("c", False)]:
+            Note.objects.create(group=group, text=text, pinned=pinned)
+
+        with self.assertNumQueries(2):
+            group = Group.objects.prefetch_properties(Group.pinned_notes).get()
+
+            self.assertCountEqual(
+                [n.text for n in group.pinned_notes], ["a", "b"]
+            )
+            self.assertEqual(
+                group.pinned_notes[0].get_deferred_fields(), {"pinned"}
+            )
+
+    def test_fields_lookup_path(self):
+        with self.assertRaises(ValueError):
+            Paths.people_groups.prefetch
+
+    def test_get_cached(self):
+        GroupFactory.create(with_people_ages=[5, 17, 45, 19])
+
+        group = Group.objects.prefetch_properties(Group.children).get()
+
+        self.assertCountEqual(
+            [c.age for c in Group.children.get_cached(group)], [5, 17]
+        )
+
+    def test_get_cached_not_prefetched(self):
+        GroupFactory.create(with_people_ages=[5, 17, 45, 19])
+
+        group = Group.objects.get()
+
+        with self.assertRaises(AttributeError):
+            Group.children.get_cached(group)
+
 
 class CombinedTestCase(DjangoTestCase):
     def test_simple(self):
@@ -115,3 +268,12 @@ class CombinedTestCase(DjangoTestCase):
 
         self.assertCountEqual([c.age for c in group2.children], [5, 17, 9])
         self.assertEqual(group2.count_times_three, 3 * 7)
+
+    def test_preparer(self):
+        GroupFactory.create(with_people_ages=[5, 17, 45, 19])
+        preparer = Preparer(Group.children, Group.count_times_three)
+
+        group = preparer.apply(Group.objects.all()).get()
+
+        self.assertCountEqual([c.age for c in group.children], [5, 17])
+        self.assertEqual(group.count_times_three, 3 * 4)